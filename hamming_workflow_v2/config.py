@@ -1,55 +1,90 @@
+import functools
 import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+from hamming_workflow_v2.utils import refresh_ui_base_url
+
+_loaded = False
+
 
+def _ensure_loaded():
+    """Load environment variables from the .env file on first use."""
+    global _loaded
+    if not _loaded:
+        load_dotenv()
+        # .env may set HAMMING_UI_BASE_URL, which utils snapshots at import
+        refresh_ui_base_url()
+        _loaded = True
 
+
+@dataclass(frozen=True)
 class Config:
     """Configuration management for Hamming CI Workflow v2."""
 
     # API Configuration
-    HAMMING_API_KEY = os.environ.get("HAMMING_API_KEY")
-    HAMMING_API_BASE_URL = os.environ.get("HAMMING_API_BASE_URL", "https://app.hamming.ai/api/rest")
+    HAMMING_API_KEY: Optional[str]
+    HAMMING_API_BASE_URL: str
 
     # Agent Configuration
-    AGENT_ID = os.environ.get("AGENT_ID")
+    AGENT_ID: Optional[str]
 
     # Test Selection
-    TAG_IDS = os.environ.get("TAG_IDS")
-    TEST_CASE_IDS = os.environ.get("TEST_CASE_IDS")
+    TAG_IDS: Optional[str]
+    TEST_CASE_IDS: Optional[str]
 
     # Phone Numbers
-    PHONE_NUMBERS = os.environ.get("PHONE_NUMBERS")
+    PHONE_NUMBERS: Optional[str]
 
     # Monitoring Configuration
-    POLL_INTERVAL_SECONDS = int(os.environ.get("POLL_INTERVAL_SECONDS", "10"))
-    TIMEOUT_SECONDS = int(os.environ.get("TIMEOUT_SECONDS", "900"))
+    POLL_INTERVAL_SECONDS: int
+    POLL_INTERVAL_MAX_SECONDS: int
+    PROGRESS_INTERVAL_SECONDS: int
+    TIMEOUT_SECONDS: int
 
     @classmethod
-    def validate_required(cls):
+    @functools.lru_cache(maxsize=1)
+    def load(cls) -> "Config":
+        """Read configuration from the environment once and return the shared instance."""
+        _ensure_loaded()
+        return cls(
+            HAMMING_API_KEY=os.environ.get("HAMMING_API_KEY"),
+            HAMMING_API_BASE_URL=os.environ.get("HAMMING_API_BASE_URL", "https://app.hamming.ai/api/rest"),
+            AGENT_ID=os.environ.get("AGENT_ID"),
+            TAG_IDS=os.environ.get("TAG_IDS"),
+            TEST_CASE_IDS=os.environ.get("TEST_CASE_IDS"),
+            PHONE_NUMBERS=os.environ.get("PHONE_NUMBERS"),
+            POLL_INTERVAL_SECONDS=int(os.environ.get("POLL_INTERVAL_SECONDS", "10")),
+            POLL_INTERVAL_MAX_SECONDS=int(os.environ.get("POLL_INTERVAL_MAX_SECONDS", "30")),
+            PROGRESS_INTERVAL_SECONDS=int(os.environ.get("PROGRESS_INTERVAL_SECONDS", "15")),
+            TIMEOUT_SECONDS=int(os.environ.get("TIMEOUT_SECONDS", "900")),
+        )
+
+    def validate_required(self):
         """Validate that required configuration is present."""
         errors = []
 
-        if not cls.HAMMING_API_KEY:
+        if not self.HAMMING_API_KEY:
             errors.append("HAMMING_API_KEY is not set")
 
-        if not cls.AGENT_ID:
+        if not self.AGENT_ID:
             errors.append("AGENT_ID is not set")
 
-        if not cls.PHONE_NUMBERS:
+        if not self.PHONE_NUMBERS:
             errors.append("PHONE_NUMBERS is not set")
 
-        if not cls.TAG_IDS and not cls.TEST_CASE_IDS:
+        if not self.TAG_IDS and not self.TEST_CASE_IDS:
             errors.append("Either TAG_IDS or TEST_CASE_IDS must be set")
 
         if errors:
             raise ValueError(f"Configuration errors: {'; '.join(errors)}")
 
-    @classmethod
-    def get_headers(cls):
-        """Get headers for API requests."""
+    @functools.cached_property
+    def headers(self) -> Dict[str, str]:
+        """Headers for API requests, built once per configuration."""
         return {
             "Content-Type": "application/json",
-            "Authorization": f"Bearer {cls.HAMMING_API_KEY}"
-        }
\ No newline at end of file
+            "Authorization": f"Bearer {self.HAMMING_API_KEY}"
+        }
@@ -1,9 +1,10 @@
 from enum import Enum
 from typing import Dict, List, Optional, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from pydantic.dataclasses import dataclass
 
 
-class TestStatus(Enum):
+class TestStatus(str, Enum):
     """Test run status values."""
     CREATED = "CREATED"
     RUNNING = "RUNNING"
@@ -15,7 +16,14 @@ class TestStatus(Enum):
     CANCELED = "CANCELED"
 
 
-class TestCaseStatus(Enum):
+# Test run statuses that count as a successful completion
+SUCCESSFUL_RUN_STATUSES = frozenset({TestStatus.COMPLETED.value, TestStatus.FINISHED.value})
+
+# Test run statuses after which the wait loop stops polling
+TERMINAL_RUN_STATUSES = frozenset({TestStatus.COMPLETED.value, TestStatus.FAILED.value, TestStatus.CANCELED.value})
+
+
+class TestCaseStatus(str, Enum):
     """Individual test case status values."""
     PASSED = "PASSED"
     FAILED = "FAILED"
@@ -23,14 +31,31 @@ class TestCaseStatus(Enum):
     ERROR = "ERROR"
 
 
-class AssertionStatus(Enum):
+class AssertionStatus(str, Enum):
     """Assertion status values."""
     PASSED = "PASSED"
     FAILED = "FAILED"
     ERROR = "ERROR"
 
 
-class PersonaOverride(BaseModel):
+# Read-only API response types are only used on cold paths, so their schema is
+# built on first use. Nested instances are never revalidated or copied, and
+# unknown keys in the API payload are ignored.
+_RESPONSE_CONFIG = ConfigDict(
+    defer_build=True,
+    frozen=True,
+    revalidate_instances="never",
+    extra="ignore"
+)
+
+
+class _ResponseModel(BaseModel):
+    """Base for read-only API response models."""
+    model_config = _RESPONSE_CONFIG
+
+
+@dataclass(config=ConfigDict(extra="ignore"), slots=True)
+class PersonaOverride:
     """Persona override configuration."""
     name: Optional[str] = None
     voice: Optional[str] = None
@@ -62,7 +87,8 @@ class TestRunResponse(BaseModel):
     message: Optional[str] = None
 
 
-class AssertionResult(BaseModel):
+@dataclass(config=_RESPONSE_CONFIG, slots=True)
+class AssertionResult:
     """Result of a single assertion."""
     assertionId: str
     assertionName: str
@@ -71,13 +97,14 @@ class AssertionResult(BaseModel):
     details: Optional[Dict[str, Any]] = None
 
 
-class AssertionsSummary(BaseModel):
+class AssertionsSummary(_ResponseModel):
     """Summary of assertions for a test case."""
     overallScore: Optional[float] = None
     categories: Optional[List[str]] = None
 
 
-class TestCaseMetrics(BaseModel):
+@dataclass(config=_RESPONSE_CONFIG, slots=True)
+class TestCaseMetrics:
     """Metrics for a test case run."""
     latencyP50: Optional[float] = None
     latencyP90: Optional[float] = None
@@ -85,7 +112,7 @@ class TestCaseMetrics(BaseModel):
     interactivityScore: Optional[float] = None
 
 
-class TestCaseResult(BaseModel):
+class TestCaseResult(_ResponseModel):
     """Result of a single test case run."""
     id: str
     testCaseId: str
@@ -100,7 +127,7 @@ class TestCaseResult(BaseModel):
     metrics: Optional[TestCaseMetrics] = None
 
 
-class AssertionCategory(BaseModel):
+class AssertionCategory(_ResponseModel):
     """Assertion category details."""
     name: str
     score: Optional[float] = None
@@ -109,13 +136,13 @@ class AssertionCategory(BaseModel):
     assertionIds: Optional[List[str]] = None
 
 
-class TestRunAssertionsSummary(BaseModel):
+class TestRunAssertionsSummary(_ResponseModel):
     """Summary of assertions at test run level."""
     overallScore: Optional[float] = None
     categories: Optional[List[AssertionCategory]] = None
 
 
-class TestRunSummary(BaseModel):
+class TestRunSummary(_ResponseModel):
     """Summary of a test run."""
     id: str
     status: str
@@ -125,14 +152,14 @@ class TestRunSummary(BaseModel):
     topIssues: Optional[List[Dict[str, Any]]] = None
 
 
-class TestRunResults(BaseModel):
+class TestRunResults(_ResponseModel):
     """Complete test run results."""
     summary: TestRunSummary
     results: List[TestCaseResult]
     resultsUrl: Optional[str] = None
 
 
-class ErrorResponse(BaseModel):
+class ErrorResponse(_ResponseModel):
     """Error response from the API."""
     message: str
     code: Optional[str] = None
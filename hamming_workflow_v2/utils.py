@@ -1,18 +1,53 @@
+import json
 import os
-from typing import Optional, List
+import re
+from typing import Any, Optional, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# A comma-separated item with surrounding whitespace excluded
+_COMMA_SEPARATED_ITEM = re.compile(r"[^,\s](?:[^,]*[^,\s])?")
+
+# E.164 phone number: '+' followed by 6-15 digits
+_E164_PHONE_NUMBER = re.compile(r"\+[0-9]{6,15}")
+
+# Hamming UI base URL, read once at import (see refresh_ui_base_url)
+_UI_BASE_URL = os.environ.get("HAMMING_UI_BASE_URL", "https://app.hamming.ai")
+
+
+def refresh_ui_base_url() -> None:
+    """Re-read HAMMING_UI_BASE_URL after the environment has changed."""
+    global _UI_BASE_URL
+    _UI_BASE_URL = os.environ.get("HAMMING_UI_BASE_URL", "https://app.hamming.ai")
 
 
 def get_test_run_url(test_run_id: str) -> str:
     """Generate the URL for viewing a test run in the Hamming UI."""
-    base_url = os.environ.get("HAMMING_UI_BASE_URL", "https://app.hamming.ai")
-    return f"{base_url}/test-runs/{test_run_id}"
+    return f"{_UI_BASE_URL}/test-runs/{test_run_id}"
+
+
+def loads_json(data: bytes) -> Any:
+    """Parse a JSON document from bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialize obj as indented JSON bytes ending in a newline, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE, default=str)
+    return (json.dumps(obj, indent=2, default=str) + "\n").encode()
 
 
 def parse_comma_separated(value: Optional[str]) -> Optional[List[str]]:
     """Parse a comma-separated string into a list of strings."""
     if not value:
         return None
-    return [item.strip() for item in value.split(",") if item.strip()]
+    return _COMMA_SEPARATED_ITEM.findall(value)
 
 
 def validate_selection_method(tag_ids: Optional[List[str]], test_case_ids: Optional[List[str]]) -> None:
@@ -29,8 +64,8 @@ def format_phone_numbers(phone_numbers: List[str]) -> List[str]:
     for number in phone_numbers:
         # Remove any whitespace
         number = number.strip()
-        # Ensure it starts with +
-        if not number.startswith("+"):
-            raise ValueError(f"Phone number must start with '+': {number}")
+        # Ensure it is in E.164 format
+        if not _E164_PHONE_NUMBER.fullmatch(number):
+            raise ValueError(f"Phone number must be in E.164 format (e.g. +15551234567): {number}")
         formatted.append(number)
     return formatted
\ No newline at end of file
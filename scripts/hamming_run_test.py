@@ -7,7 +7,12 @@ from typing import Optional, List
 
 # Add parent directory to path for imports
 import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from hamming_workflow_v2.config import Config
 from hamming_workflow_v2.types import (
@@ -19,12 +24,22 @@ from hamming_workflow_v2.utils import (
     parse_comma_separated,
     validate_selection_method,
     format_phone_numbers,
-    get_test_run_url
+    get_test_run_url,
+    loads_json
 )
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared session so connections (and TLS sessions) are reused. POST is not in
+# urllib3's default retryable methods, so only connection failures are retried
+# and a test run is never created twice.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))))
+
+# (connect, read) timeouts in seconds
+_REQUEST_TIMEOUT = (5, 30)
+
 
 def run_test(
     agent_id: str,
@@ -67,17 +82,19 @@ def run_test(
     )
 
     # Make API request
-    url = f"{Config.HAMMING_API_BASE_URL}/test-runs/test-inbound-agent"
-    headers = Config.get_headers()
+    config = Config.load()
+    url = f"{config.HAMMING_API_BASE_URL}/test-runs/test-inbound-agent"
+    headers = config.headers
 
     logger.info(f"Creating test run for agent {agent_id}")
     logger.info(f"Phone numbers: {phone_numbers}")
 
     try:
-        response = requests.post(
+        response = _session.post(
             url,
-            json=request_obj.model_dump(exclude_none=True),
-            headers=headers
+            data=request_obj.model_dump_json(exclude_none=True).encode(),
+            headers=headers,
+            timeout=_REQUEST_TIMEOUT
         )
         response.raise_for_status()
     except requests.exceptions.HTTPError as e:
@@ -87,7 +104,7 @@ def run_test(
         raise
 
     # Parse response with Pydantic model
-    response_data = response.json()
+    response_data = loads_json(response.content)
     test_run_response = TestRunResponse(**response_data)
 
     # Check if any test cases were found
@@ -108,17 +125,18 @@ def run_test(
 
 def main():
     """Main entry point for the script."""
+    config = Config.load()
     try:
         # Validate configuration
-        Config.validate_required()
+        config.validate_required()
     except ValueError as e:
         logger.error(str(e))
         sys.exit(1)
 
     # Parse configuration
-    phone_numbers = parse_comma_separated(Config.PHONE_NUMBERS)
-    tag_ids = parse_comma_separated(Config.TAG_IDS)
-    test_case_ids = parse_comma_separated(Config.TEST_CASE_IDS)
+    phone_numbers = parse_comma_separated(config.PHONE_NUMBERS)
+    tag_ids = parse_comma_separated(config.TAG_IDS)
+    test_case_ids = parse_comma_separated(config.TEST_CASE_IDS)
 
     if not phone_numbers:
         logger.error("No phone numbers provided")
@@ -126,7 +144,7 @@ def main():
 
     try:
         test_run_id = run_test(
-            agent_id=Config.AGENT_ID,
+            agent_id=config.AGENT_ID,
             phone_numbers=phone_numbers,
             tag_ids=tag_ids,
             test_case_ids=test_case_ids
@@ -1,144 +1,279 @@
 #!/usr/bin/env python3
+import argparse
+import math
+import random
 import requests
 import time
 import logging
 import sys
-import json
+from collections import Counter
+from typing import Optional, Tuple
 
 # Add parent directory to path for imports
 import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from hamming_workflow_v2.config import Config
-from hamming_workflow_v2.types import TestRunResults
-from hamming_workflow_v2.utils import get_test_run_url
+from hamming_workflow_v2.types import SUCCESSFUL_RUN_STATUSES, TERMINAL_RUN_STATUSES, TestStatus
+from hamming_workflow_v2.utils import dumps_json, get_test_run_url, loads_json
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared session so every status/results poll reuses one keep-alive connection.
+# Transient failures are retried by the adapter with exponential backoff; the
+# last response is returned once retries run out. Retry-After is left to the
+# wait loop, which caps it at the overall timeout, so throttling responses
+# (429/503) are not retried here.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=5,
+        connect=3,
+        read=3,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 504),
+        allowed_methods=("GET", "HEAD"),
+        raise_on_status=False,
+        respect_retry_after_header=False
+    )
+))
+
+# (connect, read) timeouts in seconds
+_REQUEST_TIMEOUT = (5, 30)
+
+# Responses that mean the API is throttling us rather than failing
+_THROTTLED_STATUSES = frozenset({429, 503})
+
+
+def _fetch_results(results_url: str, etag: Optional[str], cached: Optional[dict]) -> Tuple[Optional[str], dict]:
+    """
+    Fetch test run results, reusing the cached payload if it has not changed.
 
-def wait_for_test_run(test_run_id: str, timeout_seconds: int = None) -> dict:
+    Returns:
+        The (etag, results) pair to pass back in on the next call
+    """
+    headers = {"If-None-Match": etag} if etag else None
+    response = _session.get(results_url, headers=headers, timeout=_REQUEST_TIMEOUT)
+    if response.status_code == 304:
+        return etag, cached
+    response.raise_for_status()
+    return response.headers.get("ETag"), loads_json(response.content)
+
+
+def _server_poll_delay(response: requests.Response) -> int:
+    """Return the delay in seconds the server asked for before the next poll, or 0."""
+    delay = 0
+    for header in ("Retry-After", "X-Next-Poll-After"):
+        value = response.headers.get(header, "").strip()
+        # Only delta-seconds are honoured; HTTP-date forms are ignored
+        if value.isdigit():
+            delay = max(delay, int(value))
+    return delay
+
+
+def wait_for_test_run(test_run_id: str, timeout_seconds: int = None, poll_interval: float = None) -> dict:
     """
     Wait for a test run to complete and return the results.
 
     Args:
         test_run_id: The test run ID to monitor
-        timeout_seconds: Maximum time to wait (defaults to Config.TIMEOUT_SECONDS)
+        timeout_seconds: Maximum time to wait (defaults to the TIMEOUT_SECONDS setting)
+        poll_interval: Seconds between status polls after a status change (defaults to the POLL_INTERVAL_SECONDS setting)
 
     Returns:
         The test run results as a dictionary
     """
+    config = Config.load()
     if timeout_seconds is None:
-        timeout_seconds = Config.TIMEOUT_SECONDS
+        timeout_seconds = config.TIMEOUT_SECONDS
+    if poll_interval is None:
+        poll_interval = config.POLL_INTERVAL_SECONDS
 
-    status_url = f"{Config.HAMMING_API_BASE_URL}/test-runs/{test_run_id}/status"
-    results_url = f"{Config.HAMMING_API_BASE_URL}/test-runs/{test_run_id}/results"
-    headers = Config.get_headers()
+    status_url = f"{config.HAMMING_API_BASE_URL}/test-runs/{test_run_id}/status"
+    results_url = f"{config.HAMMING_API_BASE_URL}/test-runs/{test_run_id}/results"
+    _session.headers.update(config.headers)
 
-    start_time = time.time()
+    # Monotonic, so wall-clock adjustments cannot stretch or cut the timeout
+    deadline = time.monotonic() + timeout_seconds
     test_run_url = get_test_run_url(test_run_id)
 
-    logger.info(f"Waiting for test run to complete: {test_run_id}")
-    logger.info(f"View in UI: {test_run_url}")
-    logger.info(f"Timeout: {timeout_seconds} seconds")
+    logger.info("Waiting for test run to complete: %s", test_run_id)
+    logger.info("View in UI: %s", test_run_url)
+    logger.info("Timeout: %s seconds", timeout_seconds)
 
     last_status = None
+    status_etag = None
+    results_etag = None
+    cached_results = None
+    last_progress_at = None
+
+    # Poll at poll_interval after a status change, then back off towards the
+    # POLL_INTERVAL_MAX_SECONDS ceiling while the status is unchanged
+    poll_max = max(config.POLL_INTERVAL_MAX_SECONDS, poll_interval)
+    sleep_s = poll_interval
 
     while True:
         # Check timeout
-        elapsed = time.time() - start_time
-        if elapsed > timeout_seconds:
-            logger.error(f"Test run timed out after {timeout_seconds} seconds")
+        if time.monotonic() > deadline:
+            logger.error("Test run timed out after %s seconds", timeout_seconds)
             return {
                 "summary": {"id": test_run_id, "status": "TIMEOUT", "error": "Timeout waiting for test completion"},
                 "results": []
             }
 
+        status_changed = False
+        server_delay = 0
         try:
-            # Get test run status using the /status endpoint
-            response = requests.get(status_url, headers=headers)
+            # Get test run status using the /status endpoint. A 304 means the
+            # status is the same as last poll, so there is nothing to parse.
+            headers = {"If-None-Match": status_etag} if status_etag else None
+            response = _session.get(status_url, headers=headers, timeout=_REQUEST_TIMEOUT)
+            server_delay = _server_poll_delay(response)
             if response.status_code == 404:
-                logger.error(f"Test run {test_run_id} not found")
+                logger.error("Test run %s not found", test_run_id)
                 return {
                     "summary": {"id": test_run_id, "status": "NOT_FOUND", "error": "Test run not found"},
                     "results": []
                 }
-            response.raise_for_status()
-            status_data = response.json()
-
-            current_status = status_data.get("status", "UNKNOWN")
+            if response.status_code == 304:
+                if last_status is None:
+                    # No status has been read yet, so there is nothing to reuse;
+                    # ask again unconditionally
+                    status_etag = None
+                    if headers:
+                        continue
+                current_status = last_status
+            else:
+                response.raise_for_status()
+                status_data = response.json()
+
+                current_status = status_data.get("status", "UNKNOWN")
+                # Only remember the ETag once its body has been read, so a
+                # truncated or garbled response is fetched again in full
+                status_etag = response.headers.get("ETag")
 
             # Log status changes
             if current_status != last_status:
-                logger.info(f"Test run status: {current_status}")
+                logger.info("Test run status: %s", current_status)
                 last_status = current_status
+                status_changed = True
 
-            # Check if test is complete - using the statuses from the reference code
-            if current_status in ["COMPLETED", "FAILED", "CANCELED"]:
-                logger.info(f"Test run completed with status: {current_status}")
+            # Check if test is complete
+            if current_status in TERMINAL_RUN_STATUSES:
+                logger.info("Test run completed with status: %s", current_status)
 
                 # Get full results using the /results endpoint
-                results_response = requests.get(results_url, headers=headers)
-                results_response.raise_for_status()
-                results_data = results_response.json()
+                results_etag, cached_results = _fetch_results(results_url, results_etag, cached_results)
 
                 # Return the API response directly
-                return results_data
-
-            # Still running, log progress if available
-            if current_status == "RUNNING":
+                return cached_results
+
+            # Still running, log progress if available. Progress is cosmetic, so
+            # it is fetched at most once per PROGRESS_INTERVAL_SECONDS, and not at
+            # all when INFO records would be dropped.
+            now = time.monotonic()
+            if current_status == TestStatus.RUNNING and logger.isEnabledFor(logging.INFO) and (
+                last_progress_at is None or now - last_progress_at >= config.PROGRESS_INTERVAL_SECONDS
+            ):
+                last_progress_at = now
                 # Try to get current results to show progress
                 try:
-                    results_response = requests.get(results_url, headers=headers)
-                    if results_response.status_code == 200:
-                        results_data = results_response.json()
-                        test_case_runs = results_data.get("results", [])
-                        if test_case_runs:
-                            status_counts = {}
-                            for run in test_case_runs:
-                                run_status = run.get("status", "UNKNOWN")
-                                status_counts[run_status] = status_counts.get(run_status, 0) + 1
-                            logger.info(f"Progress: {len(test_case_runs)} test cases - {status_counts}")
+                    previous_results = cached_results
+                    results_etag, cached_results = _fetch_results(results_url, results_etag, cached_results)
+                    # An unchanged payload would only repeat the last progress line
+                    test_case_runs = cached_results.get("results", ()) if cached_results is not previous_results else ()
+                    if test_case_runs:
+                        status_counts = Counter(run.get("status", "UNKNOWN") for run in test_case_runs)
+                        logger.info("Progress: %d test cases - %s", len(test_case_runs), dict(status_counts))
                 except Exception as e:
-                    logger.debug(f"Could not fetch progress: {e}")
+                    logger.debug("Could not fetch progress: %s", e)
+
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code not in _THROTTLED_STATUSES:
+                raise
+            # Throttled; wait as long as the server asked before polling again
+            server_delay = _server_poll_delay(e.response)
+            logger.warning("Hamming API is throttling requests (HTTP %s); backing off", e.response.status_code)
+
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+            requests.exceptions.ContentDecodingError,
+            ValueError
+        ) as e:
+            # Retries are exhausted, or the body was truncated or not JSON (e.g. a
+            # proxy error page); keep polling until the overall timeout
+            logger.error("Error checking test run status: %s", e)
+
+        # Wait before next poll, backing off while the status is unchanged. SCORING
+        # is the last phase before completion, so it stays at poll_interval
+        # to pick up the final status promptly. Jitter keeps concurrent CI jobs
+        # from polling in lockstep, and the sleep never runs past the timeout.
+        if status_changed or last_status == TestStatus.SCORING:
+            sleep_s = poll_interval
+        else:
+            sleep_s = min(sleep_s * 1.5, poll_max)
+        # A delay requested by the server (Retry-After / X-Next-Poll-After)
+        # takes precedence over a shorter backoff.
+        delay = max(sleep_s * random.uniform(0.8, 1.2), server_delay)
+        remaining = deadline - time.monotonic()
+        time.sleep(max(0.0, min(delay, remaining)))
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error checking test run status: {e}")
 
-        # Wait before next poll
-        time.sleep(Config.POLL_INTERVAL_SECONDS)
+def _positive_float(value: str) -> float:
+    """argparse type for options that must be a finite number greater than zero."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"must be a number, got {value!r}")
+    if not (math.isfinite(number) and number > 0):
+        raise argparse.ArgumentTypeError(f"must be a finite number greater than 0, got {value}")
+    return number
 
 
 def main():
     """Main entry point for the script."""
-    if len(sys.argv) < 2:
-        logger.error("Usage: python hamming_wait_test_run.py <test_run_id>")
-        sys.exit(1)
-
-    test_run_id = sys.argv[1]
-
-    # Get timeout from environment or use default
-    timeout_seconds = Config.TIMEOUT_SECONDS
-    if len(sys.argv) > 2:
-        try:
-            timeout_seconds = int(sys.argv[2])
-        except ValueError:
-            logger.warning(f"Invalid timeout value: {sys.argv[2]}, using default: {timeout_seconds}")
+    config = Config.load()
+
+    parser = argparse.ArgumentParser(description="Wait for a Hamming test run to complete and print its results as JSON.")
+    parser.add_argument("test_run_id", help="The test run ID to monitor")
+    # Older invocations pass the timeout as a second positional argument
+    parser.add_argument("legacy_timeout", nargs="?", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--timeout", type=int, default=config.TIMEOUT_SECONDS,
+                        help="Maximum seconds to wait (default: %(default)s)")
+    parser.add_argument("--poll-interval", type=_positive_float, default=config.POLL_INTERVAL_SECONDS,
+                        help="Seconds between status polls after a status change (default: %(default)s)")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="Logging level (default: %(default)s)")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(args.log_level)
+    test_run_id = args.test_run_id
+    timeout_seconds = args.legacy_timeout if args.legacy_timeout is not None else args.timeout
 
     # Ensure API key is set
-    if not Config.HAMMING_API_KEY:
+    if not config.HAMMING_API_KEY:
         logger.error("HAMMING_API_KEY is not set")
         sys.exit(1)
 
     try:
-        results = wait_for_test_run(test_run_id, timeout_seconds)
+        results = wait_for_test_run(test_run_id, timeout_seconds, args.poll_interval)
 
         # Output results as JSON for downstream processing
-        print(json.dumps(results, indent=2, default=str))
+        sys.stdout.buffer.write(dumps_json(results))
 
         # Exit with appropriate code - "COMPLETED" is the success status
         status = results.get("summary", {}).get("status", "")
-        if status in ["COMPLETED", "FINISHED"]:
+        if status in SUCCESSFUL_RUN_STATUSES:
             sys.exit(0)
         else:
             logger.error(f"Test run failed with status: {status}")
@@ -147,6 +282,8 @@ def main():
     except Exception as e:
         logger.error(f"Error waiting for test run: {e}")
         sys.exit(1)
+    finally:
+        _session.close()
 
 
 if __name__ == "__main__":